@@ -3,65 +3,68 @@
 A simple example demonstrating the usage of MinLLM.
 """
 import asyncio
-from minllm import Node, Flow, AsyncNode, AsyncFlow
+import logging
+from minllm import Node, Flow, AsyncNode, AsyncFlow, SharedStore
+
+log = logging.getLogger(__name__)
 
 # Synchronous example
 class FirstNode(Node):
     def prep(self, shared):
-        print("FirstNode: prep")
+        log.debug("FirstNode: prep")
         return {"data": shared.get("initial_data", "default")}
     
     def exec(self, prep_res):
-        print(f"FirstNode: exec with {prep_res}")
+        log.debug("FirstNode: exec with %s", prep_res)
         return prep_res["data"].upper()
     
     def post(self, shared, prep_res, exec_res):
-        print(f"FirstNode: post with result {exec_res}")
-        shared["first_result"] = exec_res
+        log.debug("FirstNode: post with result %s", exec_res)
+        shared.set("first_result", exec_res)
         return "default"  # action to determine next node
 
 class SecondNode(Node):
     def prep(self, shared):
-        print("SecondNode: prep")
+        log.debug("SecondNode: prep")
         return {"prev_result": shared.get("first_result", "")}
     
     def exec(self, prep_res):
-        print(f"SecondNode: exec with {prep_res}")
+        log.debug("SecondNode: exec with %s", prep_res)
         return f"Processed: {prep_res['prev_result']}"
     
     def post(self, shared, prep_res, exec_res):
-        print(f"SecondNode: post with result {exec_res}")
-        shared["final_result"] = exec_res
+        log.debug("SecondNode: post with result %s", exec_res)
+        shared.set("final_result", exec_res)
         return None  # end of flow
 
 # Asynchronous example
 class AsyncFirstNode(AsyncNode):
     async def prep_async(self, shared):
-        print("AsyncFirstNode: prep")
+        log.debug("AsyncFirstNode: prep")
         return {"data": shared.get("initial_data", "default")}
     
     async def exec_async(self, prep_res):
-        print(f"AsyncFirstNode: exec with {prep_res}")
+        log.debug("AsyncFirstNode: exec with %s", prep_res)
         await asyncio.sleep(0.1)  # Simulate async work
         return prep_res["data"].upper()
     
     async def post_async(self, shared, prep_res, exec_res):
-        print(f"AsyncFirstNode: post with result {exec_res}")
+        log.debug("AsyncFirstNode: post with result %s", exec_res)
         shared["first_result"] = exec_res
         return "default"  # action to determine next node
 
 class AsyncSecondNode(AsyncNode):
     async def prep_async(self, shared):
-        print("AsyncSecondNode: prep")
+        log.debug("AsyncSecondNode: prep")
         return {"prev_result": shared.get("first_result", "")}
     
     async def exec_async(self, prep_res):
-        print(f"AsyncSecondNode: exec with {prep_res}")
+        log.debug("AsyncSecondNode: exec with %s", prep_res)
         await asyncio.sleep(0.1)  # Simulate async work
         return f"Processed: {prep_res['prev_result']}"
     
     async def post_async(self, shared, prep_res, exec_res):
-        print(f"AsyncSecondNode: post with result {exec_res}")
+        log.debug("AsyncSecondNode: post with result %s", exec_res)
         shared["final_result"] = exec_res
         return None  # end of flow
 
@@ -76,9 +79,9 @@ def run_sync_example():
     first >> second
     
     # Run flow
-    shared_data = {"initial_data": "hello world"}
+    shared_data = SharedStore(initial={"initial_data": "hello world"})
     flow.run(shared_data)
-    print(f"Final result: {shared_data['final_result']}")
+    print(f"Final result: {shared_data.get('final_result')}")
 
 async def run_async_example():
     print("\n=== Running Asynchronous Example ===")
@@ -96,8 +99,24 @@ async def run_async_example():
     print(f"Final result: {shared_data['final_result']}")
 
 if __name__ == "__main__":
-    # Run sync example
-    run_sync_example()
+    # Use uvloop's event loop when it is available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     
-    # Run async example
-    asyncio.run(run_async_example()) 
\ No newline at end of file
+    # Run both examples on one event loop, the sync one in a worker thread.
+    # They run concurrently, so their printed output may interleave.
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(asyncio.gather(
+            loop.run_in_executor(None, run_sync_example),
+            run_async_example(),
+        ))
+    finally:
+        # Same cleanup asyncio.run performs before closing its loop
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        if hasattr(loop, "shutdown_default_executor"):  # Python 3.9+
+            loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close() 
\ No newline at end of file
@@ -6,6 +6,8 @@ with synchronous and asynchronous execution patterns.
 """
 
 from ._minllm import (
+    # Shared state
+    SharedStore,
     # Base components
     BaseNode,
     Node,
@@ -21,7 +23,52 @@ from ._minllm import (
     AsyncParallelBatchFlow,
 )
 
+
+_FLOW_NODE_TYPES = (
+    BaseNode,
+    Node,
+    BatchNode,
+    Flow,
+    BatchFlow,
+    AsyncNode,
+    AsyncBatchNode,
+    AsyncParallelBatchNode,
+    AsyncFlow,
+    AsyncBatchFlow,
+    AsyncParallelBatchFlow,
+)
+
+
+def flow_of(*nodes):
+    """
+    Chain nodes with default transitions and return the first one.
+
+    ``Flow(flow_of(a, b, c))`` wires ``a -> b -> c`` and starts at ``a``,
+    whereas ``a >> b >> c`` evaluates to ``c``. Every node but the last must
+    support ``add_successor``, which currently means ``BaseNode`` and ``Node``.
+    All nodes are checked before any of them is wired.
+    """
+    if not nodes:
+        raise ValueError("flow_of requires at least one node")
+    for node in nodes[:-1]:
+        if not hasattr(node, "add_successor"):
+            raise TypeError(
+                f"flow_of cannot chain from {type(node).__name__}: "
+                "only BaseNode and Node support add_successor"
+            )
+    for node in nodes[1:]:
+        if not isinstance(node, _FLOW_NODE_TYPES):
+            raise TypeError(
+                f"flow_of cannot chain to {type(node).__name__}: "
+                "it is not a MinLLM node or flow"
+            )
+    for node, successor in zip(nodes, nodes[1:]):
+        node.add_successor(successor)
+    return nodes[0]
+
+
 __all__ = [
+    "SharedStore",
     "BaseNode",
     "Node",
     "BatchNode",
@@ -33,6 +80,7 @@ __all__ = [
     "AsyncFlow",
     "AsyncBatchFlow",
     "AsyncParallelBatchFlow",
+    "flow_of",
 ]
 
 __version__ = "0.1.0" 
\ No newline at end of file
@@ -4,9 +4,8 @@ use std::any::Any;
 use async_trait::async_trait;
 use futures::future;
 use serde_json::Value;
-use log::warn;
 
-use crate::base::{BaseNode, Node, SharedState, Action};
+use crate::base::{BaseNode, Node, SharedState, Action, Successors};
 use crate::flow::{Flow, BatchFlow};
 use crate::async_node::AsyncNodeTrait;
 use crate::error::{Error, Result};
@@ -52,18 +51,18 @@ impl AsyncFlow {
         
         curr.set_params(params);
         
-        while let Some(node) = curr.clone().into() {
-            let action = if self.is_async(&node) {
+        loop {
+            let action = if self.is_async(&curr) {
                 // This is an async node, use dynamic dispatch to call the async method
                 // For simplicity, we'll just implement a mock here
                 // In a real implementation, you'd need to handle this more robustly
                 Err(Error::InvalidOperation("Dynamic dispatch for async nodes not implemented".into()))?
             } else {
                 // Not an async node, use the synchronous method
-                node._run(shared)?
+                curr._run(shared)?
             };
             
-            curr = match self.flow.get_next_node(node, action) {
+            curr = match self.flow.next_node(&curr, action.as_deref()) {
                 Some(next) => next,
                 None => break,
             };
@@ -78,7 +77,7 @@ impl Node for AsyncFlow {
         self.base.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn Node>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.base.successors()
     }
     
@@ -89,13 +88,7 @@ impl Node for AsyncFlow {
     }
     
     fn add_successor(&self, node: Arc<dyn Node>, action: &str) -> Result<Arc<dyn Node>> {
-        let successors_lock = self.successors();
-        let mut successors = successors_lock.write().unwrap();
-        if successors.contains_key(action) {
-            warn!("Overwriting successor for action '{}'", action);
-        }
-        successors.insert(action.to_string(), node.clone());
-        Ok(node)
+        self.base.add_successor(node, action)
     }
     
     fn prep(&self, _shared: &mut SharedState) -> Result<Value> {
@@ -153,7 +146,7 @@ impl Node for AsyncBatchFlow {
         self.flow.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn Node>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.flow.successors()
     }
     
@@ -246,7 +239,7 @@ impl Node for AsyncParallelBatchFlow {
         self.batch_flow.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn Node>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.batch_flow.successors()
     }
     
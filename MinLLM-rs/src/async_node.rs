@@ -7,7 +7,7 @@ use tokio::time::sleep;
 use serde_json::Value;
 use log::warn;
 
-use crate::base::{BaseNode, Node as NodeTrait, SharedState, Action};
+use crate::base::{BaseNode, Node as NodeTrait, SharedState, Action, Successors};
 use crate::error::{Error, Result};
 
 /// Trait for asynchronous node operations
@@ -95,7 +95,7 @@ impl NodeTrait for AsyncNode {
         self.base.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn NodeTrait>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.base.successors()
     }
     
@@ -122,13 +122,7 @@ impl NodeTrait for AsyncNode {
     }
     
     fn add_successor(&self, node: Arc<dyn NodeTrait>, action: &str) -> Result<Arc<dyn NodeTrait>> {
-        let successors_lock = self.successors();
-        let mut successors = successors_lock.write().unwrap();
-        if successors.contains_key(action) {
-            warn!("Overwriting successor for action '{}'", action);
-        }
-        successors.insert(action.to_string(), node.clone());
-        Ok(node)
+        self.base.add_successor(node, action)
     }
 }
 
@@ -187,7 +181,7 @@ impl NodeTrait for AsyncBatchNode {
         self.node.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn NodeTrait>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.node.successors()
     }
     
@@ -284,7 +278,7 @@ impl NodeTrait for AsyncParallelBatchNode {
         self.node.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn NodeTrait>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.node.successors()
     }
     
@@ -3,7 +3,7 @@ use std::sync::{Arc, RwLock};
 use serde_json::Value;
 use log::warn;
 
-use crate::error::{Result};
+use crate::error::{Error, Result};
 
 /// Shared state that is passed between nodes in a flow
 pub type SharedState = HashMap<String, Value>;
@@ -11,6 +11,125 @@ pub type SharedState = HashMap<String, Value>;
 /// Action that determines the next node in a flow
 pub type Action = Option<String>;
 
+/// Get the array stored under `key` for in-place updates, creating it if missing
+fn shared_list_mut<'a>(shared: &'a mut SharedState, key: &str) -> Result<&'a mut Vec<Value>> {
+    if !shared.contains_key(key) {
+        shared.insert(key.to_string(), Value::Array(Vec::new()));
+    }
+    match shared.get_mut(key) {
+        Some(Value::Array(items)) => Ok(items),
+        _ => Err(Error::InvalidOperation(format!("Shared value '{}' is not a list", key))),
+    }
+}
+
+/// Append a value to the array stored under `key`, creating the array if missing
+pub fn append_shared(shared: &mut SharedState, key: &str, value: Value) -> Result<()> {
+    shared_list_mut(shared, key)?.push(value);
+    Ok(())
+}
+
+/// Append several values to the array stored under `key`, creating the array if missing
+pub fn extend_shared(shared: &mut SharedState, key: &str, values: Vec<Value>) -> Result<()> {
+    shared_list_mut(shared, key)?.extend(values);
+    Ok(())
+}
+
+/// Reserve room for `capacity` more values in the array stored under `key`
+pub fn reserve_shared(shared: &mut SharedState, key: &str, capacity: usize) -> Result<()> {
+    shared_list_mut(shared, key)?.reserve(capacity);
+    Ok(())
+}
+
+/// Successors of a node, keyed by action
+///
+/// The "default" successor is held in its own slot rather than in the map, so
+/// the common transition skips hashing and there is no second copy to go stale.
+#[derive(Clone, Default)]
+pub struct Successors {
+    /// Successor for the "default" action
+    default: Option<Arc<dyn Node>>,
+    
+    /// Successors for every other action
+    actions: HashMap<String, Arc<dyn Node>>,
+}
+
+impl Successors {
+    /// Create an empty set of successors
+    pub fn new() -> Self {
+        Self::default()
+    }
+    
+    /// Get the successor for an action
+    pub fn get(&self, action: &str) -> Option<&Arc<dyn Node>> {
+        if action == "default" {
+            self.default.as_ref()
+        } else {
+            self.actions.get(action)
+        }
+    }
+    
+    /// Set the successor for an action, returning the one it replaces
+    pub fn insert(&mut self, action: &str, node: Arc<dyn Node>) -> Option<Arc<dyn Node>> {
+        if action == "default" {
+            self.default.replace(node)
+        } else {
+            self.actions.insert(action.to_string(), node)
+        }
+    }
+    
+    /// Remove the successor for an action
+    pub fn remove(&mut self, action: &str) -> Option<Arc<dyn Node>> {
+        if action == "default" {
+            self.default.take()
+        } else {
+            self.actions.remove(action)
+        }
+    }
+    
+    /// Remove all successors
+    pub fn clear(&mut self) {
+        self.default = None;
+        self.actions.clear();
+    }
+    
+    /// Check whether an action has a successor
+    pub fn contains_key(&self, action: &str) -> bool {
+        self.get(action).is_some()
+    }
+    
+    /// Number of actions with a successor
+    pub fn len(&self) -> usize {
+        self.actions.len() + usize::from(self.default.is_some())
+    }
+    
+    /// Check whether there are no successors
+    pub fn is_empty(&self) -> bool {
+        self.default.is_none() && self.actions.is_empty()
+    }
+    
+    /// Iterate over the actions that have a successor
+    pub fn keys(&self) -> impl Iterator<Item = &str> {
+        self.default
+            .as_ref()
+            .map(|_| "default")
+            .into_iter()
+            .chain(self.actions.keys().map(String::as_str))
+    }
+    
+    /// Iterate over the successor nodes
+    pub fn values(&self) -> impl Iterator<Item = &Arc<dyn Node>> {
+        self.default.iter().chain(self.actions.values())
+    }
+    
+    /// Iterate over each action and its successor node
+    pub fn iter(&self) -> impl Iterator<Item = (&str, &Arc<dyn Node>)> {
+        self.default
+            .iter()
+            .map(|node| ("default", node))
+            .chain(self.actions.iter().map(|(action, node)| (action.as_str(), node)))
+    }
+}
+
 /// A base node in a workflow
 #[derive(Clone)]
 pub struct BaseNode {
@@ -18,7 +137,7 @@ pub struct BaseNode {
     params: Arc<RwLock<HashMap<String, Value>>>,
     
     /// Successors of this node, keyed by action
-    successors: Arc<RwLock<HashMap<String, Arc<dyn Node>>>>,
+    successors: Arc<RwLock<Successors>>,
 }
 
 /// Trait for node functionality
@@ -27,7 +146,7 @@ pub trait Node: Send + Sync + 'static {
     fn params(&self) -> Arc<RwLock<HashMap<String, Value>>>;
     
     /// Get a reference to the node's successors
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn Node>>>>;
+    fn successors(&self) -> Arc<RwLock<Successors>>;
     
     /// Set parameters for the node
     fn set_params(&self, params: HashMap<String, Value>);
@@ -35,6 +154,13 @@ pub trait Node: Send + Sync + 'static {
     /// Add a successor node for a given action
     fn add_successor(&self, node: Arc<dyn Node>, action: &str) -> Result<Arc<dyn Node>>;
     
+    /// Get the successor node for a given action
+    fn get_successor(&self, action: &str) -> Option<Arc<dyn Node>> {
+        let successors_lock = self.successors();
+        let successors = successors_lock.read().unwrap();
+        successors.get(action).cloned()
+    }
+    
     /// Preparation step before execution
     fn prep(&self, _shared: &mut SharedState) -> Result<Value> {
         Ok(Value::Null)
@@ -78,7 +204,7 @@ impl BaseNode {
     pub fn new() -> Self {
         Self {
             params: Arc::new(RwLock::new(HashMap::new())),
-            successors: Arc::new(RwLock::new(HashMap::new())),
+            successors: Arc::new(RwLock::new(Successors::new())),
         }
     }
 }
@@ -94,7 +220,7 @@ impl Node for BaseNode {
         self.params.clone()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn Node>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.successors.clone()
     }
     
@@ -110,7 +236,108 @@ impl Node for BaseNode {
         if successors.contains_key(action) {
             warn!("Overwriting successor for action '{}'", action);
         }
-        successors.insert(action.to_string(), node.clone());
+        successors.insert(action, node.clone());
         Ok(node)
     }
-} 
\ No newline at end of file
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use serde_json::json;
+    
+    fn node() -> Arc<dyn Node> {
+        Arc::new(BaseNode::new())
+    }
+    
+    #[test]
+    fn default_successor_follows_overwrite() {
+        let src = BaseNode::new();
+        let first = node();
+        let second = node();
+        src.add_successor(first, "default").unwrap();
+        src.add_successor(second.clone(), "default").unwrap();
+        assert!(Arc::ptr_eq(&src.get_successor("default").unwrap(), &second));
+        assert_eq!(src.successors().read().unwrap().len(), 1);
+    }
+    
+    #[test]
+    fn default_successor_follows_removal() {
+        let src = BaseNode::new();
+        let custom = node();
+        src.add_successor(node(), "default").unwrap();
+        src.add_successor(custom.clone(), "custom").unwrap();
+        
+        let successors_lock = src.successors();
+        successors_lock.write().unwrap().remove("default");
+        assert!(src.get_successor("default").is_none());
+        assert!(Arc::ptr_eq(&src.get_successor("custom").unwrap(), &custom));
+        assert_eq!(successors_lock.read().unwrap().keys().collect::<Vec<_>>(), vec!["custom"]);
+        
+        src.add_successor(node(), "default").unwrap();
+        successors_lock.write().unwrap().clear();
+        assert!(src.get_successor("default").is_none());
+        assert!(successors_lock.read().unwrap().is_empty());
+    }
+    
+    #[test]
+    fn successors_iterate_default_first() {
+        let src = BaseNode::new();
+        let default = node();
+        let custom = node();
+        src.add_successor(custom.clone(), "custom").unwrap();
+        src.add_successor(default.clone(), "default").unwrap();
+        
+        let successors_lock = src.successors();
+        let successors = successors_lock.read().unwrap();
+        let entries: Vec<_> = successors.iter().collect();
+        assert_eq!(entries.len(), 2);
+        assert_eq!(entries[0].0, "default");
+        assert!(Arc::ptr_eq(entries[0].1, &default));
+        assert_eq!(entries[1].0, "custom");
+        assert!(Arc::ptr_eq(entries[1].1, &custom));
+        
+        let nodes: Vec<_> = successors.values().collect();
+        assert!(Arc::ptr_eq(nodes[0], &default));
+        assert!(Arc::ptr_eq(nodes[1], &custom));
+    }
+
+    #[test]
+    fn append_shared_creates_and_extends_list() {
+        let mut shared = SharedState::new();
+        append_shared(&mut shared, "results", json!(1)).unwrap();
+        append_shared(&mut shared, "results", json!(2)).unwrap();
+        assert_eq!(shared["results"], json!([1, 2]));
+    }
+    
+    #[test]
+    fn extend_shared_appends_in_order() {
+        let mut shared = SharedState::new();
+        append_shared(&mut shared, "results", json!("a")).unwrap();
+        extend_shared(&mut shared, "results", vec![json!("b"), json!("c")]).unwrap();
+        assert_eq!(shared["results"], json!(["a", "b", "c"]));
+    }
+    
+    #[test]
+    fn reserve_shared_preallocates_empty_list() {
+        let mut shared = SharedState::new();
+        reserve_shared(&mut shared, "results", 8).unwrap();
+        match &shared["results"] {
+            Value::Array(items) => {
+                assert!(items.is_empty());
+                assert!(items.capacity() >= 8);
+            }
+            other => panic!("expected a list, got {:?}", other),
+        }
+    }
+    
+    #[test]
+    fn list_helpers_reject_non_list_values() {
+        let mut shared = SharedState::new();
+        shared.insert("count".to_string(), json!(3));
+        assert!(append_shared(&mut shared, "count", json!(1)).is_err());
+        assert!(extend_shared(&mut shared, "count", vec![json!(1)]).is_err());
+        assert!(reserve_shared(&mut shared, "count", 4).is_err());
+        assert_eq!(shared["count"], json!(3));
+    }
+}
@@ -3,7 +3,7 @@ use std::sync::{Arc, RwLock};
 use serde_json::Value;
 use log::warn;
 
-use crate::base::{BaseNode, Node, SharedState, Action};
+use crate::base::{BaseNode, Node, SharedState, Action, Successors};
 use crate::error::{Error, Result};
 
 /// A workflow that orchestrates execution through nodes
@@ -27,15 +27,21 @@ impl Flow {
     
     /// Get the next node based on the current node and action
     pub fn get_next_node(&self, curr: Arc<dyn Node>, action: Action) -> Option<Arc<dyn Node>> {
-        let action_key = action.unwrap_or_else(|| "default".to_string());
-        let successors_lock = curr.successors();
-        let successors = successors_lock.read().unwrap();
-        
-        let next = successors.get(&action_key).cloned();
+        self.next_node(&curr, action.as_deref())
+    }
+    
+    /// Get the next node without taking ownership of the current node or action
+    pub fn next_node(&self, curr: &Arc<dyn Node>, action: Option<&str>) -> Option<Arc<dyn Node>> {
+        let action_key = action.unwrap_or("default");
+        let next = curr.get_successor(action_key);
         
-        if next.is_none() && !successors.is_empty() {
-            let actions: Vec<String> = successors.keys().cloned().collect();
-            warn!("Flow ends: '{}' not found in {:?}", action_key, actions);
+        if next.is_none() {
+            let successors_lock = curr.successors();
+            let successors = successors_lock.read().unwrap();
+            if !successors.is_empty() {
+                let actions: Vec<&str> = successors.keys().collect();
+                warn!("Flow ends: '{}' not found in {:?}", action_key, actions);
+            }
         }
         
         next
@@ -50,9 +56,9 @@ impl Flow {
         
         curr.set_params(params);
         
-        while let Some(node) = curr.clone().into() {
-            let action = node._run(shared)?;
-            curr = match self.get_next_node(node, action) {
+        loop {
+            let action = curr._run(shared)?;
+            curr = match self.next_node(&curr, action.as_deref()) {
                 Some(next) => next,
                 None => break,
             };
@@ -67,7 +73,7 @@ impl Node for Flow {
         self.base.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn Node>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.base.successors()
     }
     
@@ -78,13 +84,7 @@ impl Node for Flow {
     }
     
     fn add_successor(&self, node: Arc<dyn Node>, action: &str) -> Result<Arc<dyn Node>> {
-        let successors_lock = self.successors();
-        let mut successors = successors_lock.write().unwrap();
-        if successors.contains_key(action) {
-            warn!("Overwriting successor for action '{}'", action);
-        }
-        successors.insert(action.to_string(), node.clone());
-        Ok(node)
+        self.base.add_successor(node, action)
     }
     
     fn _run(&self, shared: &mut SharedState) -> Result<Action> {
@@ -119,7 +119,7 @@ impl Node for BatchFlow {
         self.flow.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn Node>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.flow.successors()
     }
     
@@ -6,7 +6,7 @@ mod async_flow;
 mod python;
 mod error;
 
-pub use base::BaseNode;
+pub use base::{BaseNode, Successors, append_shared, extend_shared, reserve_shared};
 pub use node::{Node, BatchNode};
 pub use flow::{Flow, BatchFlow};
 pub use async_node::{AsyncNode, AsyncBatchNode, AsyncParallelBatchNode};
@@ -14,4 +14,4 @@ pub use async_flow::{AsyncFlow, AsyncBatchFlow, AsyncParallelBatchFlow};
 pub use error::{Error, Result};
 
 #[cfg(feature = "python")]
-pub use python::{PyNode, PyAsyncNode, PyAsyncBatchNode, PyAsyncParallelBatchNode, PyFlow, PyAsyncFlow, PyAsyncBatchFlow, PyAsyncParallelBatchFlow};
+pub use python::{PySharedStore, PyNode, PyAsyncNode, PyAsyncBatchNode, PyAsyncParallelBatchNode, PyFlow, PyAsyncFlow, PyAsyncBatchFlow, PyAsyncParallelBatchFlow};
@@ -3,9 +3,8 @@ use std::sync::{Arc, RwLock};
 use std::thread;
 use std::time::Duration;
 use serde_json::Value;
-use log::warn;
 
-use crate::base::{BaseNode, Node as NodeTrait};
+use crate::base::{BaseNode, Node as NodeTrait, Successors};
 use crate::error::{Error, Result};
 
 /// A node with retry capability
@@ -52,7 +51,7 @@ impl NodeTrait for Node {
         self.base.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn NodeTrait>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.base.successors()
     }
     
@@ -63,13 +62,7 @@ impl NodeTrait for Node {
     }
     
     fn add_successor(&self, node: Arc<dyn NodeTrait>, action: &str) -> Result<Arc<dyn NodeTrait>> {
-        let successors_lock = self.successors();
-        let mut successors = successors_lock.write().unwrap();
-        if successors.contains_key(action) {
-            warn!("Overwriting successor for action '{}'", action);
-        }
-        successors.insert(action.to_string(), node.clone());
-        Ok(node)
+        self.base.add_successor(node, action)
     }
     
     fn _exec(&self, prep_res: Value) -> Result<Value> {
@@ -125,7 +118,7 @@ impl NodeTrait for BatchNode {
         self.node.params()
     }
     
-    fn successors(&self) -> Arc<RwLock<HashMap<String, Arc<dyn NodeTrait>>>> {
+    fn successors(&self) -> Arc<RwLock<Successors>> {
         self.node.successors()
     }
     
@@ -4,11 +4,13 @@ use std::collections::HashMap;
 use std::sync::Arc;
 use pyo3::prelude::*;
 use pyo3::types::{PyDict, PyTuple, PyList};
-use pyo3::exceptions::{PyRuntimeError, PyTypeError};
+use pyo3::exceptions::{PyKeyError, PyRuntimeError, PyTypeError};
 use pyo3::PyResult;
+use pyo3::intern;
+use pyo3::sync::GILOnceCell;
 use serde_json::Value;
 
-use crate::base::{BaseNode as RustBaseNode, Node as RustNodeTrait, SharedState};
+use crate::base::{BaseNode as RustBaseNode, Node as RustNodeTrait, SharedState, Action, append_shared, extend_shared, reserve_shared};
 use crate::node::{Node as RustNode, BatchNode as RustBatchNode};
 use crate::flow::{Flow as RustFlow, BatchFlow as RustBatchFlow};
 use crate::async_node::{
@@ -79,7 +81,7 @@ fn py_to_value(py: Python, obj: &PyAny) -> PyResult<Value> {
 }
 
 /// Convert serde_json Value to Python object
-fn value_to_py(py: Python, value: Value) -> PyResult<PyObject> {
+fn value_to_py(py: Python, value: &Value) -> PyResult<PyObject> {
     match value {
         Value::Null => Ok(py.None()),
         Value::Bool(b) => Ok(b.to_object(py)),
@@ -110,8 +112,44 @@ fn value_to_py(py: Python, value: Value) -> PyResult<PyObject> {
     }
 }
 
-/// Convert Python dict to Rust SharedState
+/// Convert a Rust action to Python, reusing one interned string for "default"
+fn action_to_py(py: Python, action: Action) -> PyObject {
+    match action {
+        Some(action) if action == "default" => intern!(py, "default").to_object(py),
+        Some(action) => action.to_object(py),
+        None => py.None(),
+    }
+}
+
+/// Create a fresh empty contextvars.Context for a flow that skips context capture
+///
+/// Each run gets its own context: a Context can only be entered by one thread
+/// at a time, and ContextVar.set calls inside it must not leak into later runs.
+fn empty_context(py: Python) -> PyResult<&PyAny> {
+    static CONTEXT_TYPE: GILOnceCell<PyObject> = GILOnceCell::new();
+    let context_type = CONTEXT_TYPE.get_or_try_init(py, || -> PyResult<PyObject> {
+        Ok(py.import("contextvars")?.getattr("Context")?.into())
+    })?;
+    context_type.as_ref(py).call0()
+}
+
+/// Move the state out of a SharedStore, or convert a Python dict, for a synchronous node call
+///
+/// Callers must hand the state back with `update_py_shared`. Moving the map
+/// instead of cloning it keeps list capacity reserved with `reserve_list`.
+fn take_shared_state(py: Python, shared: &PyAny) -> PyResult<SharedState> {
+    if let Ok(mut store) = shared.extract::<PyRefMut<PySharedStore>>() {
+        return Ok(std::mem::take(&mut store.state));
+    }
+    py_dict_to_shared_state(py, shared)
+}
+
+/// Convert Python dict or SharedStore to Rust SharedState, snapshotting a SharedStore
 fn py_dict_to_shared_state(py: Python, dict: &PyAny) -> PyResult<SharedState> {
+    if let Ok(store) = dict.extract::<PyRef<PySharedStore>>() {
+        return Ok(store.state.clone());
+    }
+    
     let dict = dict.downcast::<PyDict>()?;
     let mut shared = HashMap::new();
     for (key, value) in dict.iter() {
@@ -122,6 +160,137 @@ fn py_dict_to_shared_state(py: Python, dict: &PyAny) -> PyResult<SharedState> {
     Ok(shared)
 }
 
+/// Write Rust SharedState back into a Python dict or SharedStore, key by key
+///
+/// Keys written to the store while an async flow held its snapshot are kept.
+fn update_py_shared(py: Python, shared: &PyAny, shared_state: SharedState) -> PyResult<()> {
+    if let Ok(mut store) = shared.extract::<PyRefMut<PySharedStore>>() {
+        if store.state.is_empty() {
+            // A synchronous call moved the map out, so hand it back whole
+            store.state = shared_state;
+        } else {
+            store.state.extend(shared_state);
+        }
+        return Ok(());
+    }
+    
+    let shared_dict = shared.downcast::<PyDict>()?;
+    for (key, value) in shared_state {
+        shared_dict.set_item(key, value_to_py(py, &value)?)?;
+    }
+    Ok(())
+}
+
+/// Run an async node or flow on the tokio runtime, writing the shared state back when it finishes
+fn run_async_with_locals<'p, N: AsyncNodeTrait>(
+    py: Python<'p>,
+    node: Arc<N>,
+    shared: &'p PyAny,
+    locals: pyo3_asyncio::TaskLocals,
+) -> PyResult<&'p PyAny> {
+    // Snapshot the shared state before the async block
+    let mut shared_state = py_dict_to_shared_state(py, shared)?;
+    let shared: PyObject = shared.into();
+    
+    pyo3_asyncio::tokio::future_into_py_with_locals(py, locals, async move {
+        let result = node.run_async(&mut shared_state).await;
+        
+        Python::with_gil(|py| -> PyResult<PyObject> {
+            // Hand the state back before surfacing any node error
+            update_py_shared(py, shared.as_ref(py), shared_state)?;
+            let action = result.map_err(|e| {
+                PyRuntimeError::new_err(format!("{}", e))
+            })?;
+            Ok(action_to_py(py, action))
+        })
+    })
+}
+
+/// Python wrapper for SharedState, kept on the Rust side between node runs
+///
+/// Access is serialized by the GIL and the pyclass borrow flag, so the map
+/// needs no lock of its own.
+#[pyclass(name = "SharedStore")]
+pub struct PySharedStore {
+    state: SharedState,
+}
+
+#[pymethods]
+impl PySharedStore {
+    #[new]
+    #[pyo3(signature = (initial=None))]
+    fn new(py: Python, initial: Option<&PyDict>) -> PyResult<Self> {
+        let state = match initial {
+            Some(dict) => py_dict_to_shared_state(py, dict)?,
+            None => HashMap::new(),
+        };
+        Ok(Self { state })
+    }
+    
+    #[pyo3(signature = (key, default=None), text_signature = "($self, key, default=None)")]
+    fn get(&self, py: Python, key: &str, default: Option<PyObject>) -> PyResult<PyObject> {
+        match self.state.get(key) {
+            Some(value) => value_to_py(py, value),
+            None => Ok(default.unwrap_or_else(|| py.None())),
+        }
+    }
+    
+    #[pyo3(text_signature = "($self, key, value)")]
+    fn set(&mut self, py: Python, key: String, value: &PyAny) -> PyResult<()> {
+        let value = py_to_value(py, value)?;
+        self.state.insert(key, value);
+        Ok(())
+    }
+    
+    /// Append a value to the list stored under `key` in place
+    #[pyo3(text_signature = "($self, key, value)")]
+    fn append(&mut self, py: Python, key: &str, value: &PyAny) -> PyResult<()> {
+        let value = py_to_value(py, value)?;
+        append_shared(&mut self.state, key, value).map_err(|e| {
+            PyTypeError::new_err(format!("{}", e))
+        })
+    }
+    
+    /// Append every value from an iterable to the list stored under `key`
+    #[pyo3(text_signature = "($self, key, values)")]
+    fn extend(&mut self, py: Python, key: &str, values: &PyAny) -> PyResult<()> {
+        let mut rust_values = Vec::new();
+        for value in values.iter()? {
+            rust_values.push(py_to_value(py, value?)?);
+        }
+        extend_shared(&mut self.state, key, rust_values).map_err(|e| {
+            PyTypeError::new_err(format!("{}", e))
+        })
+    }
+    
+    /// Preallocate room for `capacity` more values in the list stored under `key`
+    #[pyo3(text_signature = "($self, key, capacity)")]
+    fn reserve_list(&mut self, key: &str, capacity: usize) -> PyResult<()> {
+        reserve_shared(&mut self.state, key, capacity).map_err(|e| {
+            PyTypeError::new_err(format!("{}", e))
+        })
+    }
+    
+    fn __getitem__(&self, py: Python, key: &str) -> PyResult<PyObject> {
+        match self.state.get(key) {
+            Some(value) => value_to_py(py, value),
+            None => Err(PyKeyError::new_err(key.to_string())),
+        }
+    }
+    
+    fn __setitem__(&mut self, py: Python, key: String, value: &PyAny) -> PyResult<()> {
+        self.set(py, key, value)
+    }
+    
+    fn __contains__(&self, key: &str) -> bool {
+        self.state.contains_key(key)
+    }
+    
+    fn __len__(&self) -> usize {
+        self.state.len()
+    }
+}
+
 /// Python wrapper for BaseNode
 #[pyclass(name = "BaseNode")]
 struct PyBaseNode {
@@ -188,11 +357,16 @@ impl PyBaseNode {
     
     #[pyo3(text_signature = "($self, shared)")]
     fn prep(&self, py: Python, shared: &PyAny) -> PyResult<PyObject> {
-        let mut shared_state = py_dict_to_shared_state(py, shared)?;
-        let result = self.node.prep(&mut shared_state).map_err(|e| {
+        let mut shared_state = take_shared_state(py, shared)?;
+        let result = self.node.prep(&mut shared_state);
+        
+        // Hand the state back before surfacing any node error
+        update_py_shared(py, shared, shared_state)?;
+        
+        let result = result.map_err(|e| {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
-        value_to_py(py, result)
+        value_to_py(py, &result)
     }
     
     #[pyo3(text_signature = "($self, prep_res)")]
@@ -201,37 +375,40 @@ impl PyBaseNode {
         let result = self.node.exec(prep_value).map_err(|e| {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
-        value_to_py(py, result)
+        value_to_py(py, &result)
     }
     
     #[pyo3(text_signature = "($self, shared, prep_res, exec_res)")]
-    fn post(&self, py: Python, shared: &PyAny, prep_res: &PyAny, exec_res: &PyAny) -> PyResult<Option<String>> {
-        let mut shared_state = py_dict_to_shared_state(py, shared)?;
+    fn post(&self, py: Python, shared: &PyAny, prep_res: &PyAny, exec_res: &PyAny) -> PyResult<PyObject> {
         let prep_value = py_to_value(py, prep_res)?;
         let exec_value = py_to_value(py, exec_res)?;
+        let mut shared_state = take_shared_state(py, shared)?;
+        
+        let result = self.node.post(&mut shared_state, prep_value, exec_value);
         
-        let result = self.node.post(&mut shared_state, prep_value, exec_value).map_err(|e| {
+        // Hand the state back before surfacing any node error
+        update_py_shared(py, shared, shared_state)?;
+        
+        let result = result.map_err(|e| {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
         
-        Ok(result)
+        Ok(action_to_py(py, result))
     }
     
     #[pyo3(text_signature = "($self, shared)")]
-    fn run(&self, py: Python, shared: &PyAny) -> PyResult<Option<String>> {
-        let mut shared_state = py_dict_to_shared_state(py, shared)?;
+    fn run(&self, py: Python, shared: &PyAny) -> PyResult<PyObject> {
+        let mut shared_state = take_shared_state(py, shared)?;
+        let result = self.node.run(&mut shared_state);
+        
+        // Hand the state back before surfacing any node error
+        update_py_shared(py, shared, shared_state)?;
         
-        let result = self.node.run(&mut shared_state).map_err(|e| {
+        let result = result.map_err(|e| {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
         
-        // Update the Python shared dictionary with the values from SharedState
-        let shared_dict = shared.downcast::<PyDict>()?;
-        for (key, value) in shared_state {
-            shared_dict.set_item(key, value_to_py(py, value)?)?;
-        }
-        
-        Ok(result)
+        Ok(action_to_py(py, result))
     }
     
     fn __rshift__(&self, py: Python, other: PyObject) -> PyResult<PyObject> {
@@ -364,11 +541,16 @@ impl PyNode {
     
     #[pyo3(text_signature = "($self, shared)")]
     fn prep(&self, py: Python, shared: &PyAny) -> PyResult<PyObject> {
-        let mut shared_state = py_dict_to_shared_state(py, shared)?;
-        let result = self.node.prep(&mut shared_state).map_err(|e| {
+        let mut shared_state = take_shared_state(py, shared)?;
+        let result = self.node.prep(&mut shared_state);
+        
+        // Hand the state back before surfacing any node error
+        update_py_shared(py, shared, shared_state)?;
+        
+        let result = result.map_err(|e| {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
-        value_to_py(py, result)
+        value_to_py(py, &result)
     }
     
     #[pyo3(text_signature = "($self, prep_res)")]
@@ -377,7 +559,7 @@ impl PyNode {
         let result = self.node.exec(prep_value).map_err(|e| {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
-        value_to_py(py, result)
+        value_to_py(py, &result)
     }
     
     #[pyo3(text_signature = "($self, prep_res, exc)")]
@@ -389,37 +571,40 @@ impl PyNode {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
         
-        value_to_py(py, result)
+        value_to_py(py, &result)
     }
     
     #[pyo3(text_signature = "($self, shared, prep_res, exec_res)")]
-    fn post(&self, py: Python, shared: &PyAny, prep_res: &PyAny, exec_res: &PyAny) -> PyResult<Option<String>> {
-        let mut shared_state = py_dict_to_shared_state(py, shared)?;
+    fn post(&self, py: Python, shared: &PyAny, prep_res: &PyAny, exec_res: &PyAny) -> PyResult<PyObject> {
         let prep_value = py_to_value(py, prep_res)?;
         let exec_value = py_to_value(py, exec_res)?;
+        let mut shared_state = take_shared_state(py, shared)?;
         
-        let result = self.node.post(&mut shared_state, prep_value, exec_value).map_err(|e| {
+        let result = self.node.post(&mut shared_state, prep_value, exec_value);
+        
+        // Hand the state back before surfacing any node error
+        update_py_shared(py, shared, shared_state)?;
+        
+        let result = result.map_err(|e| {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
         
-        Ok(result)
+        Ok(action_to_py(py, result))
     }
     
     #[pyo3(text_signature = "($self, shared)")]
-    fn run(&self, py: Python, shared: &PyAny) -> PyResult<Option<String>> {
-        let mut shared_state = py_dict_to_shared_state(py, shared)?;
+    fn run(&self, py: Python, shared: &PyAny) -> PyResult<PyObject> {
+        let mut shared_state = take_shared_state(py, shared)?;
+        let result = self.node.run(&mut shared_state);
+        
+        // Hand the state back before surfacing any node error
+        update_py_shared(py, shared, shared_state)?;
         
-        let result = self.node.run(&mut shared_state).map_err(|e| {
+        let result = result.map_err(|e| {
             PyRuntimeError::new_err(format!("{}", e))
         })?;
         
-        // Update the Python shared dictionary with the values from SharedState
-        let shared_dict = shared.downcast::<PyDict>()?;
-        for (key, value) in shared_state {
-            shared_dict.set_item(key, value_to_py(py, value)?)?;
-        }
-        
-        Ok(result)
+        Ok(action_to_py(py, result))
     }
     
     fn __rshift__(&self, py: Python, other: PyObject) -> PyResult<PyObject> {
@@ -557,26 +742,8 @@ impl PyAsyncNode {
     
     #[pyo3(text_signature = "($self, shared)")]
     fn run_async<'p>(&self, py: Python<'p>, shared: &'p PyAny) -> PyResult<&'p PyAny> {
-        // Clone the shared state before the async block
-        let mut shared_state = py_dict_to_shared_state(py, shared)?;
-        let node = self.node.clone();
-        
-        let future = pyo3_asyncio::tokio::future_into_py(py, async move {
-            let result = node.run_async(&mut shared_state).await.map_err(|e| {
-                PyRuntimeError::new_err(format!("{}", e))
-            })?;
-            
-            // Convert the result to a JSON string to avoid lifetime issues
-            let result_str = match &result {
-                Some(s) => s.to_string(),
-                None => "null".to_string(),
-            };
-            
-            // Return the serialized data as a string
-            Ok(result_str)
-        })?;
-        
-        Ok(future)
+        let locals = pyo3_asyncio::tokio::get_current_locals(py)?;
+        run_async_with_locals(py, self.node.clone(), shared, locals)
     }
 }
 
@@ -624,12 +791,16 @@ impl PyAsyncParallelBatchNode {
 #[pyclass(name = "AsyncFlow")]
 pub struct PyAsyncFlow {
     flow: Arc<RustAsyncFlow>,
+    
+    /// Run the flow's future in a fresh empty context instead of copying the caller's
+    use_empty_context: bool,
 }
 
 #[pymethods]
 impl PyAsyncFlow {
     #[new]
-    fn new(py: Python, start: PyObject) -> PyResult<Self> {
+    #[pyo3(signature = (start, use_empty_context=false))]
+    fn new(py: Python, start: PyObject, use_empty_context: bool) -> PyResult<Self> {
         let start_node: &PyAny = start.extract(py)?;
         
         // Extract the Rust node from the Python object
@@ -651,6 +822,7 @@ impl PyAsyncFlow {
         
         Ok(Self {
             flow: Arc::new(RustAsyncFlow::new(start_node)),
+            use_empty_context,
         })
     }
     
@@ -659,26 +831,12 @@ impl PyAsyncFlow {
     
     #[pyo3(text_signature = "($self, shared)")]
     fn run_async<'p>(&self, py: Python<'p>, shared: &'p PyAny) -> PyResult<&'p PyAny> {
-        // Clone the shared state before the async block
-        let mut shared_state = py_dict_to_shared_state(py, shared)?;
-        let flow = self.flow.clone();
-        
-        let future = pyo3_asyncio::tokio::future_into_py(py, async move {
-            let result = flow.run_async(&mut shared_state).await.map_err(|e| {
-                PyRuntimeError::new_err(format!("{}", e))
-            })?;
-            
-            // Convert the result to a JSON string to avoid lifetime issues
-            let result_str = match &result {
-                Some(s) => s.to_string(),
-                None => "null".to_string(),
-            };
-            
-            // Return the serialized data as a string
-            Ok(result_str)
-        })?;
-        
-        Ok(future)
+        let locals = if self.use_empty_context {
+            pyo3_asyncio::TaskLocals::with_running_loop(py)?.with_context(empty_context(py)?)
+        } else {
+            pyo3_asyncio::tokio::get_current_locals(py)?
+        };
+        run_async_with_locals(py, self.flow.clone(), shared, locals)
     }
 }
 
@@ -718,6 +876,12 @@ impl PyAsyncBatchFlow {
     
     // Define similar methods as PyAsyncFlow but adapted for AsyncBatchFlow
     // Implementation details are omitted for brevity
+
+    #[pyo3(text_signature = "($self, shared)")]
+    fn run_async<'p>(&self, py: Python<'p>, shared: &'p PyAny) -> PyResult<&'p PyAny> {
+        let locals = pyo3_asyncio::tokio::get_current_locals(py)?;
+        run_async_with_locals(py, self.flow.clone(), shared, locals)
+    }
 }
 
 /// Python wrapper for AsyncParallelBatchFlow
@@ -756,11 +920,18 @@ impl PyAsyncParallelBatchFlow {
     
     // Define similar methods as PyAsyncFlow but adapted for AsyncParallelBatchFlow
     // Implementation details are omitted for brevity
+
+    #[pyo3(text_signature = "($self, shared)")]
+    fn run_async<'p>(&self, py: Python<'p>, shared: &'p PyAny) -> PyResult<&'p PyAny> {
+        let locals = pyo3_asyncio::tokio::get_current_locals(py)?;
+        run_async_with_locals(py, self.flow.clone(), shared, locals)
+    }
 }
 
 /// Initialize the module
 #[pymodule]
 fn _minllm(_py: Python, m: &PyModule) -> PyResult<()> {
+    m.add_class::<PySharedStore>()?;
     m.add_class::<PyBaseNode>()?;
     m.add_class::<PyConditionalTransition>()?;
     m.add_class::<PyNode>()?;
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from minllm import AsyncFlow, AsyncNode, Flow, Node, flow_of
+
+
+def test_flow_of_returns_head_node():
+    head = Node()
+    assert flow_of(head, Node(), Node()) is head
+    assert isinstance(Flow(head), Flow)
+
+
+def test_flow_of_single_node_is_returned_unwired():
+    node = Node()
+    assert flow_of(node) is node
+
+
+def test_flow_of_wires_default_transitions():
+    # The chain ends on an AsyncNode, which a flow can only reach by
+    # following the default transitions flow_of added
+    flow = AsyncFlow(flow_of(Node(), Node(), AsyncNode()))
+
+    async def main():
+        return await flow.run_async({})
+
+    with pytest.raises(RuntimeError, match="Use run_async"):
+        asyncio.run(main())
+
+
+def test_flow_of_requires_a_node():
+    with pytest.raises(ValueError):
+        flow_of()
+
+
+def test_flow_of_rejects_head_without_add_successor():
+    with pytest.raises(TypeError):
+        flow_of(AsyncNode(), Node())
+
+
+def test_flow_of_rejects_non_node_successor_before_wiring():
+    first = Node()
+    with pytest.raises(TypeError):
+        flow_of(first, AsyncNode(), object())
+
+    # Had first been wired to the AsyncNode, the flow would fail on reaching it
+    async def main():
+        return await AsyncFlow(first).run_async({})
+
+    assert asyncio.run(main()) is None
@@ -0,0 +1,65 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from minllm import AsyncFlow, AsyncNode, SharedStore
+
+
+def test_run_async_writes_dict_state_back():
+    shared = {"items": (1, 2)}
+
+    async def main():
+        return await AsyncNode().run_async(shared)
+
+    assert asyncio.run(main()) is None
+    # The written-back value went through the Rust state, so the tuple is now a list
+    assert shared["items"] == [1, 2]
+
+
+def test_run_async_merges_into_store_written_while_awaited():
+    shared = SharedStore(initial={"before": 1})
+
+    async def main():
+        pending = AsyncNode().run_async(shared)
+        shared["during"] = 2
+        return await pending
+
+    assert asyncio.run(main()) is None
+    assert shared["before"] == 1
+    assert shared["during"] == 2
+
+
+def test_concurrent_run_async_keep_store_writes():
+    shared = SharedStore()
+
+    async def main():
+        first = AsyncNode().run_async(shared)
+        shared["first"] = 1
+        second = AsyncNode().run_async(shared)
+        shared["second"] = 2
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(main()) == [None, None]
+    assert shared["first"] == 1
+    assert shared["second"] == 2
+
+
+def test_use_empty_context_runs_repeatedly_and_concurrently():
+    flow = AsyncFlow(AsyncNode(), use_empty_context=True)
+
+    async def main():
+        first = await flow.run_async({})
+        rest = await asyncio.gather(flow.run_async({}), flow.run_async({}))
+        return [first, *rest]
+
+    assert asyncio.run(main()) == [None, None, None]
+
+
+def test_use_empty_context_runs_on_loops_in_several_threads():
+    flow = AsyncFlow(AsyncNode(), use_empty_context=True)
+
+    async def main():
+        return await flow.run_async({})
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: asyncio.run(main()), range(8)))
+    assert results == [None] * 8
@@ -0,0 +1,43 @@
+import pytest
+
+from minllm import SharedStore
+
+
+def test_get_returns_default_for_missing_key():
+    shared = SharedStore(initial={"present": 1})
+    assert shared.get("present") == 1
+    assert shared.get("missing") is None
+    assert shared.get("missing", "fallback") == "fallback"
+
+
+def test_getitem_raises_key_error_for_missing_key():
+    shared = SharedStore()
+    with pytest.raises(KeyError):
+        shared["missing"]
+
+
+def test_setitem_and_contains():
+    shared = SharedStore()
+    shared["key"] = {"nested": [1, 2]}
+    assert "key" in shared
+    assert shared["key"] == {"nested": [1, 2]}
+    assert len(shared) == 1
+
+
+def test_append_and_extend_build_list_in_order():
+    shared = SharedStore()
+    shared.reserve_list("results", 3)
+    shared.append("results", "a")
+    shared.extend("results", ["b", "c"])
+    assert shared["results"] == ["a", "b", "c"]
+
+
+def test_list_operations_reject_non_list_values():
+    shared = SharedStore(initial={"count": 3})
+    with pytest.raises(TypeError):
+        shared.append("count", 1)
+    with pytest.raises(TypeError):
+        shared.extend("count", [1])
+    with pytest.raises(TypeError):
+        shared.reserve_list("count", 2)
+    assert shared["count"] == 3